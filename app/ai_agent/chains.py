@@ -7,6 +7,7 @@ This module implements LangChain chains for the RAG pipeline:
 - Multi-step reasoning chains
 """
 
+import threading
 from typing import Dict, Any, Optional, List
 from langchain_core.prompts import PromptTemplate, ChatPromptTemplate
 from langchain_core.documents import Document
@@ -338,9 +339,19 @@ Provide a synthesized final answer.
 # Chain Factory
 # ============================================================================
 
+# Global RAG chain instance
+_rag_chain_instance: Optional[RAGChain] = None
+_rag_chain_lock = threading.Lock()
+
+
 def get_rag_chain() -> RAGChain:
-    """Get RAG chain instance."""
-    return RAGChain()
+    """Get or create the global RAG chain instance."""
+    global _rag_chain_instance
+    if _rag_chain_instance is None:
+        with _rag_chain_lock:
+            if _rag_chain_instance is None:
+                _rag_chain_instance = RAGChain()
+    return _rag_chain_instance
 
 
 def get_structured_chain(output_model: BaseModel) -> StructuredOutputChain:
@@ -79,6 +79,12 @@ CHROMA_CLOUD_API_KEY: str = os.getenv("CHROMA_CLOUD_API_KEY", "")  # Your Chroma
 CHROMA_CLOUD_TENANT: str = os.getenv("CHROMA_CLOUD_TENANT", "")  # Your tenant ID
 CHROMA_CLOUD_DATABASE: str = os.getenv("CHROMA_CLOUD_DATABASE", "default")  # Database name in cloud
 
+# Documents embedded and written per vector store call when adding documents
+VECTOR_STORE_BATCH_SIZE: int = int(os.getenv("VECTOR_STORE_BATCH_SIZE", "500"))
+
+# Query embeddings kept in memory so repeated queries skip the embedding call
+QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+
 # ============================================================================
 # RAG Configuration
 # ============================================================================
@@ -36,7 +36,8 @@ class DocumentLoader:
         query = self.db.query(Employee)
         if limit:
             query = query.limit(limit)
-        employees = query.all()
+        # Stream employees in batches rather than materializing them all
+        employees = query.execution_options(stream_results=True).yield_per(1000)
         
         for emp in employees:
             # Get related data
@@ -5,6 +5,7 @@ This module provides a unified interface for different LLM providers
 (OpenAI and Hugging Face) to allow easy switching between providers.
 """
 
+import threading
 from typing import Optional, Literal, List, Any
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
@@ -74,7 +75,8 @@ class HuggingFaceInferenceChatModel(BaseChatModel):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.top_p = top_p
-        self._client = InferenceClient(model=model, token=api_key)
+        # Wait for a cold model to load rather than failing the first request with a 503
+        self._client = InferenceClient(model=model, token=api_key, headers={"x-wait-for-model": "true"})
     
     @property
     def _llm_type(self) -> str:
@@ -143,16 +145,34 @@ class HuggingFaceInferenceChatModel(BaseChatModel):
             raise ValueError(f"Hugging Face InferenceClient error: {e}")
 
 
+# Global LLM instance
+_llm_instance = None
+_llm_lock = threading.Lock()
+
+
 def get_llm():
     """
     Get the configured LLM instance based on AI_PROVIDER setting.
     
+    The instance is created once and shared, so its HTTP client is reused
+    across requests instead of being rebuilt by every chain.
+    
     Returns:
         LLM instance (ChatOpenAI or HuggingFaceEndpoint)
         
     Raises:
         ValueError: If provider is not configured correctly
     """
+    global _llm_instance
+    if _llm_instance is None:
+        with _llm_lock:
+            if _llm_instance is None:
+                _llm_instance = _create_llm()
+    return _llm_instance
+
+
+def _create_llm():
+    """Create a new LLM instance for the configured AI_PROVIDER."""
     if AI_PROVIDER == "openai":
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required when AI_PROVIDER is 'openai'")
@@ -296,16 +316,34 @@ def get_llm():
         raise ValueError(f"Unsupported AI_PROVIDER: {AI_PROVIDER}. Must be 'openai' or 'huggingface'")
 
 
+# Global embedding model instance
+_embedding_model_instance = None
+_embedding_model_lock = threading.Lock()
+
+
 def get_embedding_model():
     """
     Get the configured embedding model based on AI_PROVIDER setting.
     
+    The model is created once and shared, so local Hugging Face weights are
+    loaded a single time rather than by every caller.
+    
     Returns:
         Embedding model instance
         
     Raises:
         ValueError: If provider is not configured correctly
     """
+    global _embedding_model_instance
+    if _embedding_model_instance is None:
+        with _embedding_model_lock:
+            if _embedding_model_instance is None:
+                _embedding_model_instance = _create_embedding_model()
+    return _embedding_model_instance
+
+
+def _create_embedding_model():
+    """Create a new embedding model for the configured AI_PROVIDER."""
     from langchain_openai import OpenAIEmbeddings
     try:
         from langchain_huggingface import HuggingFaceEmbeddings
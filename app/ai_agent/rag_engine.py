@@ -5,6 +5,7 @@ This module implements the RAG pipeline for enriching queries
 with relevant context from the vector store.
 """
 
+import threading
 from typing import List, Dict, Any, Optional, Set
 from langchain_core.documents import Document
 
@@ -80,8 +81,8 @@ class RAGEngine:
             for q in query_variations:
                 docs = self.vector_store.similarity_search(q, k=k, filter=filter)
                 for doc in docs:
-                    # Use content hash as ID to avoid duplicates
-                    doc_id = hash(doc.page_content)
+                    # Use the stable Chroma ID to avoid duplicates (content if missing)
+                    doc_id = doc.metadata.get("chroma_id", doc.page_content)
                     if doc_id not in seen_ids:
                         seen_ids.add(doc_id)
                         all_documents.append(doc)
@@ -92,6 +93,51 @@ class RAGEngine:
             # Simple similarity search
             return self.vector_store.similarity_search(query, k=k, filter=filter)
     
+    def retrieve_context_batch(
+        self,
+        queries: List[str],
+        k: int = RAG_TOP_K,
+        filter: Optional[Dict[str, Any]] = None,
+        use_query_expansion: bool = True,
+    ) -> List[List[Document]]:
+        """
+        Retrieve relevant context for several queries at once.
+        
+        Same results as calling retrieve_context() per query, but every query
+        (and query variation) is embedded and searched in a single vector
+        store call.
+        
+        Args:
+            queries: User queries
+            k: Number of documents to retrieve per query
+            filter: Optional metadata filter
+            use_query_expansion: Whether to use query expansion
+            
+        Returns:
+            One list of relevant Document objects per query, in query order
+        """
+        if use_query_expansion and ENABLE_HYBRID_SEARCH:
+            variations_per_query = [self.expand_query(query) for query in queries]
+        else:
+            variations_per_query = [[query] for query in queries]
+        
+        flat_variations = [q for variations in variations_per_query for q in variations]
+        flat_results = iter(self.vector_store.similarity_search_batch(flat_variations, k=k, filter=filter))
+        
+        all_results = []
+        for variations in variations_per_query:
+            documents = []
+            seen_ids = set()
+            for _ in variations:
+                for doc in next(flat_results):
+                    doc_id = doc.metadata.get("chroma_id", doc.page_content)
+                    if doc_id not in seen_ids:
+                        seen_ids.add(doc_id)
+                        documents.append(doc)
+            all_results.append(documents[:k])
+        
+        return all_results
+    
     def retrieve_context_with_scores(
         self,
         query: str,
@@ -202,6 +248,7 @@ class RAGEngine:
 
 # Global RAG engine instance
 _rag_engine_instance: Optional[RAGEngine] = None
+_rag_engine_lock = threading.Lock()
 
 
 def get_rag_engine() -> RAGEngine:
@@ -213,5 +260,7 @@ def get_rag_engine() -> RAGEngine:
     """
     global _rag_engine_instance
     if _rag_engine_instance is None:
-        _rag_engine_instance = RAGEngine()
+        with _rag_engine_lock:
+            if _rag_engine_instance is None:
+                _rag_engine_instance = RAGEngine()
     return _rag_engine_instance
@@ -6,7 +6,9 @@ for storing and retrieving document embeddings.
 """
 
 import os
-from typing import List, Optional, Dict, Any
+import threading
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Iterator
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 
@@ -27,6 +29,8 @@ from app.ai_agent.config import (
     CHROMA_CLOUD_API_KEY,
     CHROMA_CLOUD_TENANT,
     CHROMA_CLOUD_DATABASE,
+    VECTOR_STORE_BATCH_SIZE,
+    QUERY_EMBEDDING_CACHE_SIZE,
 )
 from app.ai_agent.llm_provider import get_embedding_model
 
@@ -37,6 +41,11 @@ class VectorStore:
     def __init__(self):
         """Initialize the vector store."""
         self.embedding_model = get_embedding_model()
+        # Query vectors are cached (not search results, which change as the
+        # store grows), so repeated queries skip the embedding call
+        self._embed_query_cached = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            self.embedding_model.embed_query
+        )
         self.collection_name = CHROMA_COLLECTION_NAME
         self.cloud_mode = CHROMA_CLOUD_MODE == "cloud"
         
@@ -136,12 +145,21 @@ class VectorStore:
                     "Make sure you have a valid ChromaDB Cloud account and API key."
                 )
     
-    def add_documents(self, documents: List[Document]) -> List[str]:
+    def add_documents(
+        self,
+        documents: List[Document],
+        batch_size: int = VECTOR_STORE_BATCH_SIZE,
+    ) -> List[str]:
         """
         Add documents to the vector store.
         
+        Documents are added in slices of batch_size, so each slice costs one
+        embedding request and one collection write, and large loads stay
+        under ChromaDB's maximum batch size.
+        
         Args:
             documents: List of Document objects to add
+            batch_size: Number of documents per embedding/write call
             
         Returns:
             List of document IDs
@@ -149,7 +167,11 @@ class VectorStore:
         if not self._vector_store:
             self._load_or_create_store()
         
-        return self._vector_store.add_documents(documents)
+        document_ids = []
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            document_ids.extend(self._vector_store.add_documents(batch))
+        return document_ids
     
     def similarity_search(
         self,
@@ -166,16 +188,81 @@ class VectorStore:
             filter: Optional metadata filter
             
         Returns:
-            List of similar Document objects
+            List of similar Document objects, each carrying its Chroma ID in
+            metadata["chroma_id"] when the Chroma integration provides it
         """
         if not self._vector_store:
             self._load_or_create_store()
         
-        return self._vector_store.similarity_search(
-            query=query,
+        documents = self._vector_store.similarity_search_by_vector(
+            embedding=self.embed_query(query),
             k=k,
             filter=filter,
         )
+        for doc in documents:
+            doc_id = getattr(doc, "id", None)
+            if doc_id:
+                doc.metadata["chroma_id"] = doc_id
+        return documents
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a query, reusing the vector of an identical earlier query.
+        
+        Args:
+            query: Query text (surrounding whitespace is ignored)
+            
+        Returns:
+            Query embedding vector
+        """
+        return self._embed_query_cached(query.strip())
+    
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = RAG_TOP_K,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Document]]:
+        """
+        Search for similar documents for several queries at once.
+        
+        Queries are embedded with embed_query() (so query-specific prefixes
+        and the query-vector cache apply, exactly as in similarity_search) and
+        all of them are searched with one collection query, instead of one
+        Chroma round-trip per query.
+        Each returned Document carries its Chroma ID in metadata["chroma_id"].
+        
+        Args:
+            queries: Query texts
+            k: Number of documents to retrieve per query
+            filter: Optional metadata filter
+            
+        Returns:
+            One list of similar Document objects per query, in query order
+        """
+        if not self._vector_store:
+            self._load_or_create_store()
+        
+        if not queries:
+            return []
+        
+        query_embeddings = [self.embed_query(query) for query in queries]
+        results = self._vector_store._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas"],
+        )
+        
+        return [
+            [
+                Document(page_content=content, metadata={**(metadata or {}), "chroma_id": doc_id})
+                for doc_id, content, metadata in zip(ids, documents, metadatas)
+            ]
+            for ids, documents, metadatas in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        ]
     
     def similarity_search_with_score(
         self,
@@ -211,6 +298,69 @@ class VectorStore:
         
         return filtered_results
     
+    def count(self) -> int:
+        """
+        Get the exact number of documents in the collection.
+        
+        Returns:
+            Document count, read from the collection without any vector search
+        """
+        if not self._vector_store:
+            self._load_or_create_store()
+        
+        return self._vector_store._collection.count()
+    
+    def get_documents(self, limit: int = RAG_TOP_K) -> List[Document]:
+        """
+        Get stored documents without any embedding or similarity search.
+        
+        Args:
+            limit: Maximum number of documents to return
+            
+        Returns:
+            List of Document objects, each carrying its Chroma ID in metadata["chroma_id"]
+        """
+        if not self._vector_store:
+            self._load_or_create_store()
+        
+        result = self._vector_store._collection.get(
+            limit=limit,
+            include=["documents", "metadatas"],
+        )
+        return [
+            Document(page_content=content, metadata={**(metadata or {}), "chroma_id": doc_id})
+            for doc_id, content, metadata in zip(
+                result["ids"], result["documents"], result["metadatas"]
+            )
+        ]
+    
+    def iter_metadatas(self, page_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the metadata of every document in the collection.
+        
+        Metadata is fetched page by page with collection.get(), without
+        embeddings, documents or any vector search.
+        
+        Args:
+            page_size: Number of documents fetched per collection.get() call
+            
+        Yields:
+            Metadata dictionary of each document
+        """
+        if not self._vector_store:
+            self._load_or_create_store()
+        
+        collection = self._vector_store._collection
+        offset = 0
+        while True:
+            result = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            metadatas = result["metadatas"]
+            for metadata in metadatas:
+                yield metadata or {}
+            if len(metadatas) < page_size:
+                break
+            offset += page_size
+    
     def delete_collection(self):
         """Delete the entire collection (use with caution)."""
         if self._vector_store:
@@ -222,6 +372,7 @@ class VectorStore:
 # Global vector store instance
 _vector_store_instance: Optional[VectorStore] = None
 _current_collection_name: Optional[str] = None
+_vector_store_lock = threading.Lock()
 
 
 def get_vector_store() -> VectorStore:
@@ -238,7 +389,9 @@ def get_vector_store() -> VectorStore:
     
     # Check if collection name has changed (provider switch)
     if _vector_store_instance is None or _current_collection_name != CHROMA_COLLECTION_NAME:
-        _vector_store_instance = VectorStore()
-        _current_collection_name = CHROMA_COLLECTION_NAME
+        with _vector_store_lock:
+            if _vector_store_instance is None or _current_collection_name != CHROMA_COLLECTION_NAME:
+                _vector_store_instance = VectorStore()
+                _current_collection_name = CHROMA_COLLECTION_NAME
     
     return _vector_store_instance
@@ -3,8 +3,9 @@ Salary Management System Database Schema
 Using Neon Database (PostgreSQL-compatible)
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, Text, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, Text, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime, date
 import enum
@@ -61,6 +62,15 @@ class Employee(Base):
     off_days = relationship("OffDay", back_populates="employee")
     salary_payments = relationship("SalaryPayment", foreign_keys="SalaryPayment.employee_id", back_populates="employee")
     
+    @hybrid_property
+    def full_name(self):
+        """First and last name; usable in queries as a SQL expression."""
+        return f"{self.first_name} {self.last_name}"
+    
+    @full_name.expression
+    def full_name(cls):
+        return cls.first_name + " " + cls.last_name
+    
     def __repr__(self):
         return f"<Employee(id={self.id}, name={self.first_name} {self.last_name}, role={self.role.value})>"
 
@@ -104,6 +114,12 @@ class Bill(Base):
     billed_employee = relationship("Employee", foreign_keys=[billed_employee_id], back_populates="bills_received")
     recorded_by = relationship("Employee", foreign_keys=[recorded_by_id], back_populates="bills_recorded")
 
+    # Indexes for per-employee salary sums and the manager "recent bills" listing
+    __table_args__ = (
+        Index('ix_bill_billed_employee_id', billed_employee_id),
+        Index('ix_bill_recorded_by_date', recorded_by_id, date.desc()),
+    )
+
     def __repr__(self):
         return f"<Bill(id={self.id}, billed_employee_id={self.billed_employee_id}, amount_billed={self.amount_billed})>"
 
@@ -128,6 +144,12 @@ class Advance(Base):
     # Relationship back to employee
     employee = relationship("Employee", back_populates="advances")
 
+    # Indexes for approved-advance sums and the admin advances listing
+    __table_args__ = (
+        Index('ix_advance_employee_status', employee_id, status),
+        Index('ix_advance_created_at', created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<Advance(id={self.id}, employee_id={self.employee_id}, amount={self.amount_for_advance}, status={self.status.value})>"
 
@@ -160,6 +182,11 @@ class OffDay(Base):
     # Relationship back to employee
     employee = relationship("Employee", back_populates="off_days")
 
+    # Index for per-employee off day lookups ordered by request time
+    __table_args__ = (
+        Index('ix_off_days_employee_created', employee_id, created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<OffDay(id={self.id}, employee_id={self.employee_id}, date={self.date}, day_count={self.day_count}, status={self.status.value})>"
 
@@ -188,6 +215,11 @@ class SalaryPayment(Base):
     employee = relationship("Employee", foreign_keys=[employee_id], back_populates="salary_payments")
     paid_by = relationship("Employee", foreign_keys=[paid_by_id])
     
+    # Index for per-employee payment history ordered by payment date
+    __table_args__ = (
+        Index('ix_salary_payment_employee_date', employee_id, payment_date.desc()),
+    )
+    
     def __repr__(self):
         return f"<SalaryPayment(id={self.id}, employee_id={self.employee_id}, amount_paid={self.amount_paid}, payment_date={self.payment_date})>"
 
@@ -198,13 +230,26 @@ def create_tables(engine):
     print("Tables created successfully!")
 
 
-def get_engine(database_url):
-    """Create and return a database engine"""
-    return create_engine(database_url, echo=True)
+# Engines already created, keyed by database URL
+_engine_cache = {}
 
 
-def get_session(engine):
-    """Create and return a session"""
-    Session = sessionmaker(bind=engine)
+def get_engine(database_url):
+    """Return the database engine for database_url, creating it on first use"""
+    engine = _engine_cache.get(database_url)
+    if engine is None:
+        engine = create_engine(
+            database_url,
+            echo=True,
+            pool_pre_ping=False,
+            pool_recycle=3600,
+        )
+        _engine_cache[database_url] = engine
+    return engine
+
+
+def get_session(engine, **session_options):
+    """Create and return a session (session_options are passed to sessionmaker)"""
+    Session = sessionmaker(bind=engine, **session_options)
     return Session()
 
@@ -3,6 +3,7 @@ Service for handling daily employee attendance updates.
 Updates days_worked_this_month and total_days_worked fields daily.
 """
 from datetime import date, datetime, timedelta
+from sqlalchemy import Date, and_, case, cast, extract, func, or_, select, update
 from sqlalchemy.orm import Session
 from app.models.schema import Employee, OffDay, OffDayStatus
 
@@ -111,16 +112,39 @@ def update_employee_attendance_for_date(
     return True
 
 
+def _approved_off_day_on_sql(check_date: date):
+    """
+    SQL equivalent of is_today_off_day() for the employee in the enclosing
+    statement.
+    """
+    return (
+        select(OffDay.id)
+        .where(
+            OffDay.employee_id == Employee.id,
+            OffDay.status == OffDayStatus.APPROVED,
+            OffDay.date <= check_date,
+            OffDay.date + (OffDay.day_count - 1) >= check_date,
+        )
+        .exists()
+    )
+
+
 def update_all_employees_attendance(
     db: Session,
-    update_date: date = None
+    update_date: date = None,
+    commit: bool = True
 ) -> dict:
     """
     Update attendance for all active employees for a specific date.
     
+    Runs as a couple of set-based UPDATEs (same results as calling
+    update_employee_attendance_for_date for each employee).
+    
     Args:
         db: Database session
         update_date: Date to update for (defaults to today)
+        commit: Commit the changes (pass False to leave them in the caller's
+                transaction)
     
     Returns:
         Dictionary with update statistics
@@ -128,52 +152,68 @@ def update_all_employees_attendance(
     if update_date is None:
         update_date = date.today()
     
-    # Get all employees who have started employment
-    employees = db.query(Employee).filter(
-        Employee.employment_start_date <= update_date
-    ).all()
+    started = Employee.employment_start_date <= update_date
+    counted_today = cast(Employee.updated_at, Date) == update_date
+    pending = and_(started, or_(Employee.updated_at.is_(None), ~counted_today))
+    off_day = _approved_off_day_on_sql(update_date)
+    
+    total_employees, already_counted_count = db.execute(
+        select(
+            func.count(Employee.id),
+            func.count(Employee.id).filter(counted_today),
+        ).where(started)
+    ).one()
+    
+    now = datetime.now()
+    
+    # Off days: only stamp updated_at, to prevent reprocessing if the script
+    # runs multiple times
+    off_day_result = db.execute(
+        update(Employee)
+        .where(pending, off_day)
+        .values(updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    
+    # Working day: restart the monthly counter on the first update of a new
+    # month, then increment both counters
+    new_month = or_(
+        extract("year", Employee.updated_at) != update_date.year,
+        extract("month", Employee.updated_at) != update_date.month,
+    )
+    if update_date.day == 1:
+        # First time updating and it's the 1st - monthly counter starts at 0
+        new_month = or_(Employee.updated_at.is_(None), new_month)
+    updated_result = db.execute(
+        update(Employee)
+        .where(pending, ~off_day)
+        .values(
+            days_worked_this_month=case(
+                (new_month, 1),
+                else_=func.coalesce(Employee.days_worked_this_month, 0) + 1,
+            ),
+            total_days_worked=func.coalesce(Employee.total_days_worked, 0) + 1,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if commit:
+        db.commit()
     
-    stats = {
-        'total_employees': len(employees),
-        'updated': 0,
-        'off_days': 0,
+    return {
+        'total_employees': total_employees,
+        'updated': updated_result.rowcount,
+        'off_days': off_day_result.rowcount,
         'not_started': 0,
-        'already_counted': 0
+        'already_counted': already_counted_count
     }
-    
-    for employee in employees:
-        # Check if already updated today
-        if employee.updated_at and employee.updated_at.date() == update_date:
-            stats['already_counted'] += 1
-            continue
-        
-        # Don't count before employment start
-        if update_date < employee.employment_start_date:
-            stats['not_started'] += 1
-            continue
-        
-        # Check if already updated today (early exit for efficiency)
-        if employee.updated_at and employee.updated_at.date() == update_date:
-            stats['already_counted'] += 1
-            continue
-        
-        # Check if off day
-        if is_today_off_day(db, employee.id, update_date):
-            stats['off_days'] += 1
-            # Still update the timestamp to track that we processed today
-            # (to prevent reprocessing if script runs multiple times)
-            employee.updated_at = datetime.now()
-            db.commit()
-            continue
-        
-        # Update attendance
-        if update_employee_attendance_for_date(db, employee, update_date):
-            stats['updated'] += 1
-    
-    return stats
 
 
-def reset_monthly_attendance_for_new_month(db: Session, target_date: date = None) -> int:
+def reset_monthly_attendance_for_new_month(
+    db: Session,
+    target_date: date = None,
+    commit: bool = True
+) -> int:
     """
     Reset days_worked_this_month for all employees at the start of a new month.
     This should be called once per month.
@@ -182,6 +222,8 @@ def reset_monthly_attendance_for_new_month(db: Session, target_date: date = None
         db: Database session
         target_date: Date to check (defaults to today). If it's the 1st of a month,
                     will reset monthly counts.
+        commit: Commit the changes (pass False to leave them in the caller's
+                transaction)
     
     Returns:
         Number of employees whose monthly attendance was reset
@@ -193,17 +235,16 @@ def reset_monthly_attendance_for_new_month(db: Session, target_date: date = None
     if target_date.day != 1:
         return 0
     
-    # Get all employees
-    employees = db.query(Employee).all()
-    
-    reset_count = 0
-    for employee in employees:
-        # Reset days_worked_this_month at the start of each month
-        if employee.days_worked_this_month is not None and employee.days_worked_this_month > 0:
-            employee.days_worked_this_month = 0
-            reset_count += 1
+    # Reset days_worked_this_month at the start of each month
+    result = db.execute(
+        update(Employee)
+        .where(Employee.days_worked_this_month > 0)
+        .values(days_worked_this_month=0)
+        .execution_options(synchronize_session=False)
+    )
+    reset_count = result.rowcount
     
-    if reset_count > 0:
+    if commit and reset_count > 0:
         db.commit()
     
     return reset_count
@@ -4,7 +4,7 @@ Handles carrying forward negative balances (debts) to the next month.
 """
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 from app.models.schema import Employee, Bill, Advance, AdvanceStatus
 
 
@@ -64,7 +64,11 @@ def update_employee_used_salary(db: Session, employee_id: int) -> float:
     return used_salary
 
 
-def reset_monthly_salary_for_new_month(db: Session, target_date: date = None) -> dict:
+def reset_monthly_salary_for_new_month(
+    db: Session,
+    target_date: date = None,
+    commit: bool = True
+) -> dict:
     """
     Reset monthly salary for all employees at the start of a new month.
     Carries forward negative balances (debts) to the new month.
@@ -78,6 +82,8 @@ def reset_monthly_salary_for_new_month(db: Session, target_date: date = None) ->
         db: Database session
         target_date: Date to check (defaults to today). If it's the 1st of a month,
                     will reset monthly salary.
+        commit: Commit the changes (pass False to leave them in the caller's
+                transaction)
     
     Returns:
         Dictionary with reset statistics
@@ -93,38 +99,34 @@ def reset_monthly_salary_for_new_month(db: Session, target_date: date = None) ->
             'reset_to_zero': 0
         }
     
-    employees = db.query(Employee).all()
+    base_salary = func.coalesce(Employee.salary, 0)
+    current_used_salary = func.coalesce(Employee.used_salary, 0)
+    
+    # Reset to zero if they had positive used salary within their base salary.
+    # Runs first so the carried-forward debts below are not zeroed again.
+    reset_result = db.execute(
+        update(Employee)
+        .where(current_used_salary > 0, current_used_salary <= base_salary)
+        .values(used_salary=0.0)
+        .execution_options(synchronize_session=False)
+    )
+    
+    # If remaining is negative (they owe money), carry forward the excess
+    # used salary beyond base salary as the debt to start the new month with
+    carry_result = db.execute(
+        update(Employee)
+        .where(current_used_salary > base_salary)
+        .values(used_salary=current_used_salary - base_salary)
+        .execution_options(synchronize_session=False)
+    )
     
     stats = {
-        'reset_count': 0,
-        'carried_forward': 0,
-        'reset_to_zero': 0
+        'reset_count': reset_result.rowcount + carry_result.rowcount,
+        'carried_forward': carry_result.rowcount,
+        'reset_to_zero': reset_result.rowcount
     }
     
-    for employee in employees:
-        if employee.used_salary is None:
-            employee.used_salary = 0.0
-        
-        base_salary = float(employee.salary or 0)
-        current_used_salary = float(employee.used_salary or 0)
-        
-        # Calculate remaining salary (can be negative)
-        remaining_salary = base_salary - current_used_salary
-        
-        # If remaining is negative (they owe money), carry forward the excess
-        if remaining_salary < 0:
-            # Carry forward the debt (excess used salary beyond base salary)
-            excess = current_used_salary - base_salary
-            employee.used_salary = excess  # Start new month with the debt
-            stats['carried_forward'] += 1
-            stats['reset_count'] += 1
-        elif current_used_salary > 0:
-            # Reset to zero if they had positive used salary
-            employee.used_salary = 0.0
-            stats['reset_to_zero'] += 1
-            stats['reset_count'] += 1
-    
-    if stats['reset_count'] > 0:
+    if commit and stats['reset_count'] > 0:
         db.commit()
     
     return stats
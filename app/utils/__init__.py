@@ -5,6 +5,7 @@ from .attendance import (
     calculate_days_worked_this_month,
     calculate_total_days_worked,
     update_employee_attendance,
+    update_all_employee_attendance,
     calculate_off_days_in_range,
 )
 
@@ -12,5 +13,6 @@ __all__ = [
     'calculate_days_worked_this_month',
     'calculate_total_days_worked',
     'update_employee_attendance',
+    'update_all_employee_attendance',
     'calculate_off_days_in_range',
 ]
@@ -3,6 +3,7 @@ Utility functions for calculating employee attendance and days worked.
 """
 from datetime import date, datetime
 from typing import List
+from sqlalchemy import Date, Numeric, and_, case, cast, func, literal, select, update
 from sqlalchemy.orm import Session
 from app.models.schema import Employee, OffDay, OffDayStatus
 
@@ -176,3 +177,92 @@ def update_employee_attendance(
     db.commit()
     db.refresh(employee)
     return employee
+
+
+def _approved_off_days_in_window_sql(window_start, window_end):
+    """
+    SQL equivalent of calculate_off_days_in_range() for the employee in the
+    enclosing query: overlap of each approved off day request with the window,
+    half days weighted 0.5.
+    """
+    off_day_end = OffDay.date + (OffDay.day_count - 1)
+    overlap_days = func.greatest(
+        0,
+        func.least(off_day_end, window_end, type_=Date)
+        - func.greatest(OffDay.date, window_start, type_=Date)
+        + 1,
+    )
+    day_value = case((OffDay.off_type == "half", 0.5), else_=1.0)
+    return (
+        select(func.coalesce(func.sum(day_value * overlap_days), 0))
+        .where(
+            OffDay.employee_id == Employee.id,
+            OffDay.status == OffDayStatus.APPROVED,
+        )
+        .scalar_subquery()
+    )
+
+
+def _days_worked_sql(days):
+    """max(0, int(round(days))) in SQL, rounding half to even like Python."""
+    days = cast(days, Numeric)
+    whole = func.floor(days)
+    fraction = days - whole
+    rounded = whole + case(
+        (fraction > 0.5, 1),
+        (and_(fraction == 0.5, func.mod(whole, 2) == 1), 1),
+        else_=0,
+    )
+    return func.greatest(0, rounded)
+
+
+def update_all_employee_attendance(
+    db: Session,
+    reference_date: date = None
+) -> int:
+    """
+    Recalculate days_worked_this_month and total_days_worked for every employee
+    with a single set-based UPDATE (same results as update_employee_attendance).
+    
+    Args:
+        db: Database session
+        reference_date: Date to calculate from (defaults to today)
+    
+    Returns:
+        Number of employees updated
+    """
+    if reference_date is None:
+        reference_date = date.today()
+    
+    end_date = literal(min(reference_date, date.today()), Date)
+    month_start = literal(date(reference_date.year, reference_date.month, 1), Date)
+    month_window_start = func.greatest(month_start, Employee.employment_start_date, type_=Date)
+    
+    # Calendar days in each window minus approved off days in that window
+    worked = (
+        select(
+            Employee.id.label("employee_id"),
+            (
+                end_date - month_window_start + 1
+                - _approved_off_days_in_window_sql(month_window_start, end_date)
+            ).label("month_days"),
+            (
+                end_date - Employee.employment_start_date + 1
+                - _approved_off_days_in_window_sql(Employee.employment_start_date, end_date)
+            ).label("total_days"),
+        )
+        .subquery()
+    )
+    
+    stmt = (
+        update(Employee)
+        .where(Employee.id == worked.c.employee_id)
+        .values(
+            days_worked_this_month=_days_worked_sql(worked.c.month_days),
+            total_days_worked=_days_worked_sql(worked.c.total_days),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
@@ -1,19 +1,23 @@
 from datetime import date, datetime
-from typing import List, Optional, Literal, Dict, Any
+from typing import Callable, List, Optional, Literal, Dict, Any
 from pathlib import Path
+import json
+import logging
 import os
+import threading
+from itertools import islice
 
 from fastapi import Depends, FastAPI, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from sqlalchemy import func
-from sqlalchemy.orm import Session, sessionmaker, aliased
+from sqlalchemy import exists, func, text
+from sqlalchemy.orm import Query, Session, sessionmaker, aliased
 
 from app.config.config import DATABASE_URL
 from app.models.schema import (
@@ -28,13 +32,25 @@ from app.models.schema import (
     UserAuth,
     SalaryPayment,
 )
-from app.utils.attendance import update_employee_attendance
+from app.utils.attendance import update_employee_attendance, update_all_employee_attendance
 from app.services.salary_payment_service import (
     record_salary_payment,
     get_employee_salary_payments,
-    get_all_salary_payments,
 )
 
+# The AI agent is optional: if langchain/chromadb are missing or broken the
+# payroll API still starts, and the AI endpoints report the import error
+try:
+    from app.ai_agent.report_generator import ReportGenerator
+    from app.ai_agent.rag_engine import get_rag_engine
+    from app.ai_agent.chains import get_rag_chain
+    from app.ai_agent.query_processor import QueryProcessor
+    AI_AGENT_IMPORT_ERROR = None
+except ImportError as e:
+    AI_AGENT_IMPORT_ERROR = e
+AI_AGENT_AVAILABLE = AI_AGENT_IMPORT_ERROR is None
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Database setup
@@ -53,7 +69,8 @@ except Exception as e:
     SessionLocal = None
 
 
-def get_db() -> Session:
+def open_session() -> Session:
+    """Create a new session, initializing the engine lazily if needed."""
     global engine, SessionLocal
     
     if SessionLocal is None:
@@ -67,13 +84,84 @@ def get_db() -> Session:
                 detail="Database connection not configured. Please set DATABASE_URL environment variable."
             )
     
-    db = SessionLocal()
+    return SessionLocal()
+
+
+def require_ai_agent() -> None:
+    """Raise the AI agent's import error (call inside an AI handler's try block)."""
+    if not AI_AGENT_AVAILABLE:
+        raise ImportError(f"AI agent is unavailable: {AI_AGENT_IMPORT_ERROR}")
+
+
+def get_db() -> Session:
+    db = open_session()
     try:
         yield db
     finally:
         db.close()
 
 
+def begin_report_transaction(db: Session) -> Session:
+    """
+    Start a read-only reporting transaction on the session.
+    Runs as READ COMMITTED READ ONLY so long dashboard SELECTs
+    don't hold locks that contend with concurrent bill/advance writes.
+    """
+    db.connection(execution_options={"isolation_level": "READ COMMITTED"})
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SET TRANSACTION READ ONLY"))
+    return db
+
+
+def get_report_db(db: Session = Depends(get_db)) -> Session:
+    """Session for read-only reporting endpoints."""
+    return begin_report_transaction(db)
+
+
+# Rows fetched per round-trip when streaming report listings
+STREAM_BATCH_SIZE = 500
+
+
+def stream_report(build_query: Callable[[Session], Query], to_item: Callable[..., BaseModel]) -> StreamingResponse:
+    """
+    Stream a report listing as a JSON array.
+    Rows are fetched with a server-side cursor in batches of STREAM_BATCH_SIZE
+    and serialized one at a time, so the full result is never held in memory.
+    
+    The query runs and the first batch is serialized before the response is
+    returned, so setup, query and serialization errors still produce a 500;
+    once the 200 and the opening "[" have been sent, a failure can only cut
+    the body short, so it is logged.
+    
+    The session is owned by the response body (not a Depends) because it has
+    to stay open until the last row has been sent.
+    """
+    db = open_session()
+    try:
+        begin_report_transaction(db)
+        rows = iter(build_query(db).execution_options(stream_results=True).yield_per(STREAM_BATCH_SIZE))
+        first_items = [to_item(*row).model_dump_json().encode() for row in islice(rows, STREAM_BATCH_SIZE)]
+    except Exception:
+        db.close()
+        raise
+    
+    def generate():
+        try:
+            yield b"[" + b",".join(first_items)
+            # A short first batch means the cursor is already exhausted
+            if len(first_items) == STREAM_BATCH_SIZE:
+                for row in rows:
+                    yield b"," + to_item(*row).model_dump_json().encode()
+            yield b"]"
+        except Exception:
+            logger.exception("Report stream failed after the response had started")
+            raise
+        finally:
+            db.close()
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -84,7 +172,7 @@ def calculate_remaining_salary(employee_id: int, db: Session) -> float:
     Returns: remaining_salary = salary - used_salary (can be negative)
     where used_salary = sum(bills) + sum(approved advances)
     """
-    employee = db.query(Employee).get(employee_id)
+    employee = db.get(Employee, employee_id)
     if not employee:
         return 0.0
     
@@ -112,6 +200,23 @@ def calculate_remaining_salary(employee_id: int, db: Session) -> float:
     return remaining
 
 
+def employee_exists(db: Session, employee_id: int) -> bool:
+    """Check that an employee exists without loading the row."""
+    return db.query(exists().where(Employee.id == employee_id)).scalar()
+
+
+def get_employees_by_ids(db: Session, ids) -> Dict[int, Employee]:
+    """
+    Load several employees with a single IN query.
+    Returns a dict mapping employee id -> Employee (missing ids are absent).
+    """
+    ids = set(ids)
+    if not ids:
+        return {}
+    employees = db.query(Employee).filter(Employee.id.in_(ids)).all()
+    return {emp.id: emp for emp in employees}
+
+
 # ---------------------------------------------------------------------------
 # Pydantic schemas
 # ---------------------------------------------------------------------------
@@ -160,7 +265,7 @@ class AdvanceOut(BaseModel):
     amount_for_advance: float
     reason: Optional[str] = None
     status: str
-    created_at: datetime
+    created_at: Optional[datetime] = None
     approved_at: Optional[datetime] = None
     approval_notes: Optional[str] = None
 
@@ -186,7 +291,7 @@ class OffDayOut(BaseModel):
     off_type: str
     reason: Optional[str] = None
     status: str
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -348,6 +453,26 @@ if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
+def _warm_ai_agent():
+    try:
+        get_rag_engine()
+        get_rag_chain()
+    except Exception as e:
+        logger.warning("AI agent warm-up failed: %s", e)
+
+
+@app.on_event("startup")
+def warm_ai_agent():
+    """
+    Create the shared RAG engine and chain in a background thread at startup
+    so the first AI request doesn't pay for LLM/embedding client and vector
+    store initialization, without making app readiness wait on it.
+    """
+    if not AI_AGENT_AVAILABLE:
+        return
+    threading.Thread(target=_warm_ai_agent, name="ai-agent-warm-up", daemon=True).start()
+
+
 # ---------------------------------------------------------------------------
 # Template routes (serve HTML pages)
 # ---------------------------------------------------------------------------
@@ -583,7 +708,7 @@ def get_user_pin(employee_id: int, db: Session = Depends(get_db)):
     Retrieve the PIN for an employee by their employee_id.
     Returns None if no PIN has been set for this employee.
     """
-    employee = db.query(Employee).get(employee_id)
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found.")
 
@@ -602,7 +727,7 @@ def set_user_pin(payload: UserAuthCreate, db: Session = Depends(get_db)):
     Assign or update a 4-digit PIN for an employee.
     The PIN is stored in the user_auth table along with the employee's first name.
     """
-    employee = db.query(Employee).get(payload.employee_id)
+    employee = db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found.")
 
@@ -627,7 +752,7 @@ def set_user_pin(payload: UserAuthCreate, db: Session = Depends(get_db)):
 
 @app.post("/api/advances", status_code=status.HTTP_201_CREATED, tags=["advances"])
 def create_advance(payload: AdvanceCreate, db: Session = Depends(get_db)):
-    employee = db.query(Employee).get(payload.employee_id)
+    employee = db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found.")
 
@@ -693,7 +818,7 @@ def approve_advance(advance_id: int, payload: AdvanceApprovalRequest, db: Sessio
     """
     Approve or reject an advance request (admin only).
     """
-    advance = db.query(Advance).get(advance_id)
+    advance = db.get(Advance, advance_id)
     if not advance:
         raise HTTPException(status_code=404, detail="Advance not found.")
 
@@ -701,7 +826,7 @@ def approve_advance(advance_id: int, payload: AdvanceApprovalRequest, db: Sessio
         raise HTTPException(status_code=400, detail=f"Advance is already {advance.status.value}. Cannot change status.")
 
     # Get employee for response (needed for both approval and rejection)
-    employee = db.query(Employee).get(advance.employee_id)
+    employee = db.get(Employee, advance.employee_id)
     
     if payload.approved:
         # Check remaining salary before approving advance
@@ -778,7 +903,7 @@ def approve_advance(advance_id: int, payload: AdvanceApprovalRequest, db: Sessio
     return AdvanceOut(
         id=advance.id,
         employee_id=employee.id,
-        employee_name=f"{employee.first_name} {employee.last_name}",
+        employee_name=employee.full_name,
         amount_for_advance=advance.amount_for_advance,
         reason=advance.reason,
         status=status_value,
@@ -802,7 +927,7 @@ def create_bill(payload: BillCreate, db: Session = Depends(get_db)):
     Create a bill for a staff or manager. Only managers or admins may create bills.
     Managers cannot create bills for themselves.
     """
-    manager = db.query(Employee).get(payload.manager_id)
+    manager = db.get(Employee, payload.manager_id)
     if not manager:
         raise HTTPException(status_code=404, detail=f"Manager with ID {payload.manager_id} not found.")
     
@@ -814,7 +939,7 @@ def create_bill(payload: BillCreate, db: Session = Depends(get_db)):
             detail=f"Only managers or admins can create bills. User role is: {role_value}"
         )
 
-    employee = db.query(Employee).get(payload.employee_id)
+    employee = db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee to bill not found.")
 
@@ -826,25 +951,14 @@ def create_bill(payload: BillCreate, db: Session = Depends(get_db)):
     remaining_salary = calculate_remaining_salary(employee.id, db)
     base_salary = float(employee.salary or 0)
     
-    # Calculate what the new used amount would be
-    bills_sum = (
-        db.query(func.coalesce(func.sum(Bill.amount_billed), 0.0))
-        .filter(Bill.billed_employee_id == employee.id)
-        .scalar()
-    )
-    advances_sum = (
-        db.query(func.coalesce(func.sum(Advance.amount_for_advance), 0.0))
-        .filter(
-            Advance.employee_id == employee.id,
-            Advance.status == AdvanceStatus.APPROVED,
-        )
-        .scalar()
-    )
-    current_used = float(bills_sum or 0) + float(advances_sum or 0)
-    new_used = current_used + payload.amount
-    new_remaining = base_salary - new_used
-    
-    # Allow bills even if they exceed salary, but we'll return a warning in the response
+    # Allow bills even if they exceed salary, but we'll return a warning in the response.
+    # Only build it when this bill actually takes remaining salary negative; it is
+    # formatted before commit so the employee's name doesn't need reloading.
+    warning = None
+    if payload.amount > remaining_salary:
+        new_remaining = remaining_salary - payload.amount
+        new_used = base_salary - new_remaining
+        warning = f"⚠️ WARNING: {employee.full_name} has exceeded their salary. Remaining salary: KSH {new_remaining:,.2f} (negative). Total used: KSH {new_used:,.2f} out of base salary: KSH {base_salary:,.2f}."
 
     bill_datetime = (
         payload.date if isinstance(payload.date, datetime) else datetime.combine(payload.date, datetime.min.time())
@@ -865,20 +979,19 @@ def create_bill(payload: BillCreate, db: Session = Depends(get_db)):
     
     # Prepare response with warning if salary is exceeded
     response = {"id": bill.id}
-    if new_remaining < 0:
-        response["warning"] = f"⚠️ WARNING: {employee.first_name} {employee.last_name} has exceeded their salary. Remaining salary: KSH {new_remaining:,.2f} (negative). Total used: KSH {new_used:,.2f} out of base salary: KSH {base_salary:,.2f}."
+    if warning:
+        response["warning"] = warning
     
     return response
 
 
 @app.post("/api/off-days", status_code=status.HTTP_201_CREATED, tags=["off_days"])
 def create_off_day(payload: OffDayCreate, db: Session = Depends(get_db)):
-    employee = db.query(Employee).get(payload.employee_id)
-    if not employee:
+    if not employee_exists(db, payload.employee_id):
         raise HTTPException(status_code=404, detail="Employee not found.")
 
     off = OffDay(
-        employee_id=employee.id,
+        employee_id=payload.employee_id,
         date=payload.date,
         day_count=payload.day_count,
         off_type=payload.off_type,
@@ -902,7 +1015,7 @@ def approve_off_day(off_day_id: int, payload: OffDayApprovalRequest, db: Session
     Approve or deny an off day request (admin only).
     Updates employee attendance when status changes.
     """
-    off_day = db.query(OffDay).get(off_day_id)
+    off_day = db.get(OffDay, off_day_id)
     if not off_day:
         raise HTTPException(status_code=404, detail="Off day request not found.")
 
@@ -919,17 +1032,16 @@ def approve_off_day(off_day_id: int, payload: OffDayApprovalRequest, db: Session
     db.refresh(off_day)
 
     # Update employee attendance after status change
-    employee = db.query(Employee).get(off_day.employee_id)
+    employee = off_day.employee
     if employee:
         update_employee_attendance(db, employee)
-        db.refresh(employee)
 
     status_value = off_day.status.value if hasattr(off_day.status, 'value') else str(off_day.status)
     
     return OffDayOut(
         id=off_day.id,
         employee_id=employee.id,
-        employee_name=f"{employee.first_name} {employee.last_name}",
+        employee_name=employee.full_name,
         days_worked_this_month=employee.days_worked_this_month,
         total_days_worked=employee.total_days_worked,
         date=off_day.date,
@@ -947,7 +1059,7 @@ def refresh_employee_attendance(employee_id: int, db: Session = Depends(get_db))
     Manually refresh attendance calculations for an employee.
     Useful for recalculating after data changes.
     """
-    employee = db.query(Employee).get(employee_id)
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found.")
     
@@ -966,12 +1078,7 @@ def refresh_all_attendance(db: Session = Depends(get_db)):
     Refresh attendance calculations for all employees.
     Admin only endpoint.
     """
-    employees = db.query(Employee).all()
-    updated_count = 0
-    
-    for employee in employees:
-        update_employee_attendance(db, employee)
-        updated_count += 1
+    updated_count = update_all_employee_attendance(db)
     
     return {
         "message": f"Attendance refreshed for {updated_count} employees",
@@ -984,7 +1091,7 @@ def refresh_all_attendance(db: Session = Depends(get_db)):
 # ---------------------------------------------------------------------------
 
 @app.get("/api/admin/salary-summary", response_model=List[SalarySummaryItem], tags=["reports"])
-def get_salary_summary(db: Session = Depends(get_db)):
+def get_salary_summary(db: Session = Depends(get_report_db)):
     """
     For each employee, compute:
     - used_salary = sum(bills) + sum(approved advances)
@@ -1052,7 +1159,7 @@ class SalaryPaymentOut(BaseModel):
     notes: Optional[str] = None
     paid_by_id: int
     paid_by_name: str
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -1073,18 +1180,19 @@ def create_salary_payment(payload: SalaryPaymentCreate, db: Session = Depends(ge
             notes=payload.notes
         )
         
-        employee = db.query(Employee).get(payload.employee_id)
-        admin = db.query(Employee).get(payload.admin_id)
+        # Both were loaded by record_salary_payment; served from the identity map
+        employee = db.get(Employee, payload.employee_id)
+        admin = db.get(Employee, payload.admin_id)
         
         return SalaryPaymentOut(
             id=payment.id,
             employee_id=payment.employee_id,
-            employee_name=f"{employee.first_name} {employee.last_name}",
+            employee_name=employee.full_name,
             amount_paid=payment.amount_paid,
             payment_date=payment.payment_date,
             notes=payment.notes,
             paid_by_id=payment.paid_by_id,
-            paid_by_name=f"{admin.first_name} {admin.last_name}",
+            paid_by_name=admin.full_name,
             created_at=payment.created_at
         )
     except ValueError as e:
@@ -1102,56 +1210,66 @@ def create_salary_payment(payload: SalaryPaymentCreate, db: Session = Depends(ge
 
 
 @app.get("/api/salary-payments", response_model=List[SalaryPaymentOut], tags=["salary_payments"])
-def get_salary_payments(db: Session = Depends(get_db)):
+def get_salary_payments():
     """
     Get all salary payment records (admin only).
     """
-    payments = get_all_salary_payments(db)
+    PaidEmployee = aliased(Employee)
+    PayingAdmin = aliased(Employee)
     
-    results = []
-    for payment in payments:
-        employee = db.query(Employee).get(payment.employee_id)
-        admin = db.query(Employee).get(payment.paid_by_id)
-        
-        results.append(SalaryPaymentOut(
+    def build_query(db: Session) -> Query:
+        return (
+            db.query(
+                SalaryPayment,
+                PaidEmployee.full_name.label("employee_name"),
+                PayingAdmin.full_name.label("paid_by_name"),
+            )
+            .outerjoin(PaidEmployee, SalaryPayment.employee_id == PaidEmployee.id)
+            .outerjoin(PayingAdmin, SalaryPayment.paid_by_id == PayingAdmin.id)
+            .order_by(SalaryPayment.payment_date.desc(), SalaryPayment.created_at.desc())
+        )
+    
+    def to_item(payment, employee_name, paid_by_name) -> SalaryPaymentOut:
+        return SalaryPaymentOut.model_construct(
             id=payment.id,
             employee_id=payment.employee_id,
-            employee_name=f"{employee.first_name} {employee.last_name}" if employee else "Unknown",
+            employee_name=employee_name or "Unknown",
             amount_paid=payment.amount_paid,
             payment_date=payment.payment_date,
             notes=payment.notes,
             paid_by_id=payment.paid_by_id,
-            paid_by_name=f"{admin.first_name} {admin.last_name}" if admin else "Unknown",
+            paid_by_name=paid_by_name or "Unknown",
             created_at=payment.created_at
-        ))
+        )
     
-    return results
+    return stream_report(build_query, to_item)
 
 
 @app.get("/api/salary-payments/employee/{employee_id}", response_model=List[SalaryPaymentOut], tags=["salary_payments"])
-def get_employee_salary_payments_api(employee_id: int, db: Session = Depends(get_db)):
+def get_employee_salary_payments_api(employee_id: int, db: Session = Depends(get_report_db)):
     """
     Get all salary payment records for a specific employee.
     """
-    employee = db.query(Employee).get(employee_id)
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found.")
     
     payments = get_employee_salary_payments(db, employee_id)
+    admins = get_employees_by_ids(db, {p.paid_by_id for p in payments})
     
     results = []
     for payment in payments:
-        admin = db.query(Employee).get(payment.paid_by_id)
+        admin = admins.get(payment.paid_by_id)
         
         results.append(SalaryPaymentOut(
             id=payment.id,
             employee_id=payment.employee_id,
-            employee_name=f"{employee.first_name} {employee.last_name}",
+            employee_name=employee.full_name,
             amount_paid=payment.amount_paid,
             payment_date=payment.payment_date,
             notes=payment.notes,
             paid_by_id=payment.paid_by_id,
-            paid_by_name=f"{admin.first_name} {admin.last_name}" if admin else "Unknown",
+            paid_by_name=admin.full_name if admin else "Unknown",
             created_at=payment.created_at
         ))
     
@@ -1163,16 +1281,15 @@ def get_employee_salary_payments_api(employee_id: int, db: Session = Depends(get
     response_model=List[BillOut],
     tags=["reports"],
 )
-def get_manager_recent_bills(manager_id: int, limit: int = 20, db: Session = Depends(get_db)):
+def get_manager_recent_bills(manager_id: int, limit: int = 20, db: Session = Depends(get_report_db)):
     """
     Return recent bills recorded by a manager (for manager dashboard).
     """
-    manager = db.query(Employee).get(manager_id)
-    if not manager:
+    if not employee_exists(db, manager_id):
         raise HTTPException(status_code=404, detail="Manager not found.")
 
     qs = (
-        db.query(Bill, Employee)
+        db.query(Bill, Employee.full_name.label("employee_name"), Employee.role)
         .join(Employee, Bill.billed_employee_id == Employee.id)
         .filter(Bill.recorded_by_id == manager_id)
         .order_by(Bill.date.desc())
@@ -1181,14 +1298,14 @@ def get_manager_recent_bills(manager_id: int, limit: int = 20, db: Session = Dep
     )
 
     items: List[BillOut] = []
-    for bill, emp in qs:
+    for bill, employee_name, role in qs:
         items.append(
             BillOut(
                 id=bill.id,
                 date=bill.date,
-                employee_id=emp.id,
-                employee_name=f"{emp.first_name} {emp.last_name}",
-                role=emp.role.value,
+                employee_id=bill.billed_employee_id,
+                employee_name=employee_name,
+                role=role.value,
                 amount=bill.amount_billed,
                 reason=bill.reason,
                 record_type="bill",
@@ -1199,39 +1316,36 @@ def get_manager_recent_bills(manager_id: int, limit: int = 20, db: Session = Dep
 
 
 @app.get("/api/admin/advances", response_model=List[AdvanceOut], tags=["reports"])
-def get_all_advances(db: Session = Depends(get_db)):
+def get_all_advances():
     """
     Get all advances with their status (for admin dashboard details tab).
     """
-    qs = (
-        db.query(Advance, Employee)
-        .join(Employee, Advance.employee_id == Employee.id)
-        .order_by(Advance.created_at.desc())
-        .all()
-    )
+    def build_query(db: Session) -> Query:
+        return (
+            db.query(Advance, Employee.full_name.label("employee_name"))
+            .join(Employee, Advance.employee_id == Employee.id)
+            .order_by(Advance.created_at.desc())
+        )
 
-    items: List[AdvanceOut] = []
-    for advance, emp in qs:
+    def to_item(advance, employee_name) -> AdvanceOut:
         status_value = advance.status.value if hasattr(advance.status, 'value') else str(advance.status)
-        items.append(
-            AdvanceOut(
-                id=advance.id,
-                employee_id=emp.id,
-                employee_name=f"{emp.first_name} {emp.last_name}",
-                amount_for_advance=advance.amount_for_advance,
-                reason=advance.reason,
-                status=status_value,
-                created_at=advance.created_at,
-                approved_at=advance.approved_at,
-                approval_notes=advance.approval_notes,
-            )
+        return AdvanceOut.model_construct(
+            id=advance.id,
+            employee_id=advance.employee_id,
+            employee_name=employee_name,
+            amount_for_advance=advance.amount_for_advance,
+            reason=advance.reason,
+            status=status_value,
+            created_at=advance.created_at,
+            approved_at=advance.approved_at,
+            approval_notes=advance.approval_notes,
         )
 
-    return items
+    return stream_report(build_query, to_item)
 
 
 @app.get("/api/admin/bills", response_model=List[BillOut], tags=["reports"])
-def get_all_bills(db: Session = Depends(get_db)):
+def get_all_bills():
     """
     Get all bills (for admin dashboard details tab).
     """
@@ -1239,65 +1353,69 @@ def get_all_bills(db: Session = Depends(get_db)):
     BilledEmployee = aliased(Employee)
     RecorderEmployee = aliased(Employee)
     
-    qs = (
-        db.query(Bill, BilledEmployee, RecorderEmployee)
-        .join(BilledEmployee, Bill.billed_employee_id == BilledEmployee.id)
-        .join(RecorderEmployee, Bill.recorded_by_id == RecorderEmployee.id)
-        .order_by(Bill.date.desc())
-        .all()
-    )
-
-    items: List[BillOut] = []
-    for bill, billed_emp, recorder_emp in qs:
-        items.append(
-            BillOut(
-                id=bill.id,
-                date=bill.date,
-                employee_id=billed_emp.id,
-                employee_name=f"{billed_emp.first_name} {billed_emp.last_name}",
-                role=billed_emp.role.value if hasattr(billed_emp.role, 'value') else str(billed_emp.role),
-                amount=bill.amount_billed,
-                reason=bill.reason,
-                record_type="bill",
-                recorded_by_name=f"{recorder_emp.first_name} {recorder_emp.last_name}",
+    def build_query(db: Session) -> Query:
+        return (
+            db.query(
+                Bill,
+                BilledEmployee.full_name.label("employee_name"),
+                BilledEmployee.role,
+                RecorderEmployee.full_name.label("recorded_by_name"),
             )
+            .join(BilledEmployee, Bill.billed_employee_id == BilledEmployee.id)
+            .join(RecorderEmployee, Bill.recorded_by_id == RecorderEmployee.id)
+            .order_by(Bill.date.desc())
         )
 
-    return items
+    def to_item(bill, employee_name, role, recorded_by_name) -> BillOut:
+        return BillOut.model_construct(
+            id=bill.id,
+            date=bill.date,
+            employee_id=bill.billed_employee_id,
+            employee_name=employee_name,
+            role=role.value if hasattr(role, 'value') else str(role),
+            amount=bill.amount_billed,
+            reason=bill.reason,
+            record_type="bill",
+            recorded_by_name=recorded_by_name,
+        )
+
+    return stream_report(build_query, to_item)
 
 
 @app.get("/api/admin/off-days", response_model=List[OffDayOut], tags=["reports"])
-def get_all_off_days(db: Session = Depends(get_db)):
+def get_all_off_days():
     """
     Get all off days with employee information (for admin dashboard).
     """
-    qs = (
-        db.query(OffDay, Employee)
-        .join(Employee, OffDay.employee_id == Employee.id)
-        .order_by(OffDay.created_at.desc())
-        .all()
-    )
+    def build_query(db: Session) -> Query:
+        return (
+            db.query(
+                OffDay,
+                Employee.full_name.label("employee_name"),
+                Employee.days_worked_this_month,
+                Employee.total_days_worked,
+            )
+            .join(Employee, OffDay.employee_id == Employee.id)
+            .order_by(OffDay.created_at.desc())
+        )
 
-    items: List[OffDayOut] = []
-    for off_day, emp in qs:
+    def to_item(off_day, employee_name, days_worked_this_month, total_days_worked) -> OffDayOut:
         status_value = off_day.status.value if hasattr(off_day.status, 'value') else str(off_day.status)
-        items.append(
-            OffDayOut(
-                id=off_day.id,
-                employee_id=emp.id,
-                employee_name=f"{emp.first_name} {emp.last_name}",
-                days_worked_this_month=emp.days_worked_this_month,
-                total_days_worked=emp.total_days_worked,
-                date=off_day.date,
-                day_count=off_day.day_count,
-                off_type=off_day.off_type,
-                reason=off_day.reason,
-                status=status_value,
-                created_at=off_day.created_at,
-            )
+        return OffDayOut.model_construct(
+            id=off_day.id,
+            employee_id=off_day.employee_id,
+            employee_name=employee_name,
+            days_worked_this_month=days_worked_this_month,
+            total_days_worked=total_days_worked,
+            date=off_day.date,
+            day_count=off_day.day_count,
+            off_type=off_day.off_type,
+            reason=off_day.reason,
+            status=status_value,
+            created_at=off_day.created_at,
         )
 
-    return items
+    return stream_report(build_query, to_item)
 
 
 # ---------------------------------------------------------------------------
@@ -1321,7 +1439,7 @@ def ai_summarize(
     - status: Summary of pending/completed transactions
     """
     try:
-        from app.ai_agent.report_generator import ReportGenerator
+        require_ai_agent()
         
         # Initialize report generator
         generator = ReportGenerator(db)
@@ -1412,7 +1530,7 @@ def ai_report(
     - analytical: Trend analysis and anomaly detection
     """
     try:
-        from app.ai_agent.report_generator import ReportGenerator
+        require_ai_agent()
         
         # Initialize report generator
         generator = ReportGenerator(db)
@@ -1482,9 +1600,7 @@ def ai_query(
     - "Generate a financial report for last month"
     """
     try:
-        from app.ai_agent.rag_engine import get_rag_engine
-        from app.ai_agent.chains import get_rag_chain
-        from app.ai_agent.query_processor import QueryProcessor
+        require_ai_agent()
         
         # Initialize components
         rag_engine = get_rag_engine()
@@ -1516,11 +1632,11 @@ def ai_query(
                     employee_id=employee_id,
                     employee_name=employee_name,
                 )
-                if "error" not in employee_data:
-                    import json
-                    query_data = json.dumps(employee_data, indent=2)
-            except:
-                pass
+                if employee_data and "error" not in employee_data:
+                    # Compact JSON: it only feeds the prompt, indentation just costs tokens
+                    query_data = json.dumps(employee_data, separators=(",", ":"))
+            except Exception as e:
+                logger.warning("Could not load employee data for AI query: %s", e)
         
         # Generate response using RAG chain
         response = rag_chain.invoke(
@@ -1540,9 +1656,8 @@ def ai_query(
         )
     
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        traceback.print_exc()
+        logger.warning("Error processing AI query: %s", error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
         return AIResponse(
             success=False,
             result=None,
@@ -0,0 +1,21 @@
+"""
+Uncaught-exception handler for the test scripts.
+
+Importing this module makes an uncaught exception print a one-line error
+followed by the full traceback. The interpreter then exits with status 1 as
+usual, so the scripts don't each need a catch-all try/except.
+"""
+
+import sys
+import traceback
+
+
+def _hook(exc_type, exc, tb):
+    if issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc, tb)
+        return
+    print(f"❌ Error: {exc}")
+    traceback.print_exception(exc_type, exc, tb)
+
+
+sys.excepthook = _hook
@@ -0,0 +1,117 @@
+"""
+Opt-in local response cache for the Hugging Face test scripts.
+
+With ``--cache``, identical prompts sent to an identically configured LLM are
+answered from a small SQLite database instead of going back to the inference
+API, which is handy when iterating on a script. It is off by default, so a
+normal run always proves the API actually answers, and cached answers are
+marked as such in the script output.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+CACHE_PATH = Path.home() / ".cache" / "salary_system" / "hf_cache.sqlite"
+
+# LLM attributes that change what comes back (endpoint, model, sampling);
+# whichever of these the configured LLM class has are part of the cache key
+_IDENTIFYING_ATTRS = (
+    "model",
+    "model_name",
+    "repo_id",
+    "endpoint_url",
+    "openai_api_base",
+    "temperature",
+    "max_tokens",
+    "max_new_tokens",
+    "top_p",
+)
+
+_connection = None
+_enabled = False
+
+
+def set_enabled(enabled):
+    """Turn the cache on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def add_cache_argument(parser):
+    """Add the shared ``--cache`` flag to an argparse parser."""
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse locally cached responses for identical prompts instead of calling the API",
+    )
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _connection = sqlite3.connect(str(CACHE_PATH), isolation_level=None)
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT)"
+        )
+    return _connection
+
+
+def _serialize_messages(messages):
+    if isinstance(messages, str):
+        return messages
+    return [(type(message).__name__, message.content) for message in messages]
+
+
+def _llm_identity(llm):
+    identity = {"class": type(llm).__name__}
+    identity.update(getattr(llm, "_identifying_params", None) or {})
+    for attr in _IDENTIFYING_ATTRS:
+        value = getattr(llm, attr, None)
+        if value is not None:
+            identity[attr] = value
+    # ChatHuggingFace keeps the endpoint settings on its wrapped LLM
+    wrapped = getattr(llm, "llm", None)
+    if wrapped is not None:
+        identity["llm"] = _llm_identity(wrapped)
+    return identity
+
+
+def _cache_key(llm, messages, params):
+    payload = json.dumps(
+        [_llm_identity(llm), _serialize_messages(messages), params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _response_text(response):
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def cached_invoke(llm, messages, **params):
+    """
+    Run ``llm.invoke(messages, **params)`` and return ``(text, cached)``.
+
+    ``text`` is the response content; ``cached`` is True when it was read from
+    the local cache instead of being returned by the API.
+    """
+    if not _enabled:
+        return _response_text(llm.invoke(messages, **params)), False
+
+    connection = _get_connection()
+    key = _cache_key(llm, messages, params)
+    row = connection.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+    if row is not None:
+        return json.loads(row[0])["content"], True
+
+    text = _response_text(llm.invoke(messages, **params))
+    connection.execute(
+        "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+        (key, json.dumps({"content": text})),
+    )
+    return text, False
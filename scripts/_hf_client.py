@@ -0,0 +1,23 @@
+"""
+Shared Hugging Face InferenceClient for the test scripts.
+
+Clients are cached per (model, api_key), so repeated lookups within a run
+reuse the same client and its HTTP connection pool.
+"""
+
+from functools import lru_cache
+
+from huggingface_hub import InferenceClient
+
+
+@lru_cache(maxsize=4)
+def get_inference_client(model, api_key):
+    """Get the InferenceClient for a model, creating it on first use."""
+    # x-use-cache lets the Inference API answer a repeated identical request
+    # from its cache instead of generating it again; x-wait-for-model makes a
+    # cold model hold the request while it loads instead of returning a 503
+    return InferenceClient(
+        model=model,
+        token=api_key,
+        headers={"x-use-cache": "true", "x-wait-for-model": "true"},
+    )
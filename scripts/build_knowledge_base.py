@@ -45,7 +45,8 @@ def main():
         # Connect to database
         print("Connecting to database...")
         engine = get_engine(DATABASE_URL)
-        session = get_session(engine)
+        # Read-only bulk load: no pending changes to flush, no reloads after commit
+        session = get_session(engine, autoflush=False, expire_on_commit=False)
         
         # Create knowledge base builder
         builder = KnowledgeBaseBuilder(session)
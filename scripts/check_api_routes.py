@@ -17,26 +17,31 @@ try:
     print("Checking API Routes")
     print("=" * 60)
     
-    # Get all routes
-    routes = []
+    # Single pass over the routes: count them, keep only the salary route
+    # lines to print, and note the POST route as it goes by
+    total_routes = 0
+    salary_routes = []
+    post_found = False
     for route in app.routes:
-        if hasattr(route, 'path') and hasattr(route, 'methods'):
-            routes.append({
-                'path': route.path,
-                'methods': list(route.methods) if route.methods else []
-            })
+        path = getattr(route, 'path', None)
+        if not path or not hasattr(route, 'methods'):
+            continue
+        total_routes += 1
+        if 'salary' not in path.lower():
+            continue
+        route_methods = route.methods or ()
+        methods = ', '.join([m for m in route_methods if m != 'HEAD' and m != 'OPTIONS'])
+        salary_routes.append(f"  ✓ {methods:6} {path}")
+        if 'POST' in route_methods and 'salary-payments' in path:
+            post_found = True
     
-    # Find salary payment routes
-    salary_routes = [r for r in routes if 'salary' in r['path'].lower()]
-    
-    print(f"\nTotal routes: {len(routes)}")
+    print(f"\nTotal routes: {total_routes}")
     print(f"Salary-related routes: {len(salary_routes)}\n")
     
     if salary_routes:
         print("Salary payment routes found:")
-        for route in salary_routes:
-            methods = ', '.join([m for m in route['methods'] if m != 'HEAD' and m != 'OPTIONS'])
-            print(f"  ✓ {methods:6} {route['path']}")
+        for line in salary_routes:
+            print(line)
     else:
         print("✗ No salary payment routes found!")
         print("\nThis means the routes aren't being registered.")
@@ -46,8 +51,7 @@ try:
         print("  3. Server needs restart")
     
     # Check for POST route specifically
-    post_route = [r for r in salary_routes if 'POST' in r['methods'] and 'salary-payments' in r['path']]
-    if post_route:
+    if post_found:
         print(f"\n✓ POST /api/salary-payments route is registered!")
     else:
         print(f"\n✗ POST /api/salary-payments route NOT found!")
@@ -57,6 +61,7 @@ try:
     
 except Exception as e:
     import traceback
-    print(f"Error loading app: {str(e)}")
-    print(f"\nTraceback:\n{traceback.format_exc()}")
+    print(f"Error loading app: {str(e)}", file=sys.stderr)
+    print("\nTraceback:", file=sys.stderr)
+    traceback.print_exc()
     sys.exit(1)
@@ -9,6 +9,7 @@ This script allows you to:
 """
 
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Add project root to path
@@ -38,8 +39,9 @@ def check_collection_info():
         
         # Try to get collection info
         try:
-            # Search for any document to verify collection exists
-            results = vector_store.similarity_search("test", k=1)
+            # Read the document count to verify the collection exists
+            # (no query embedding needed)
+            vector_store.count()
             print(f"✅ Collection '{CHROMA_COLLECTION_NAME}' exists and is accessible")
         except Exception as e:
             print(f"⚠️  Could not query collection: {e}")
@@ -61,55 +63,48 @@ def count_documents():
     
     try:
         vector_store = get_vector_store()
-        rag_engine = get_rag_engine()
         
-        # Try different queries to get documents
-        test_queries = [
-            "employee",
-            "financial",
-            "advance",
-            "summary",
-            "report"
-        ]
+        # Exact count straight from the collection, no embeddings or ANN search
+        doc_count = vector_store.count()
         
-        all_doc_ids = set()
-        for query in test_queries:
-            try:
-                docs = rag_engine.retrieve_context(query, k=100)  # Get many
-                for doc in docs:
-                    # Use content hash as unique identifier
-                    doc_id = hash(doc.page_content)
-                    all_doc_ids.add(doc_id)
-            except:
-                pass
-        
-        if all_doc_ids:
-            print(f"✅ Found approximately {len(all_doc_ids)} unique documents")
+        if doc_count:
+            print(f"✅ Found {doc_count} documents")
         else:
             print("⚠️  No documents found in collection")
             print("   Collection may be empty")
         
-        # Try a direct search
+        # Fetch a page of documents directly (no embedding or ANN search)
         try:
-            results = vector_store.similarity_search("", k=100)
-            print(f"   Direct search found: {len(results)} documents")
+            results = vector_store.get_documents(limit=100)
+            print(f"   Direct fetch returned: {len(results)} documents")
         except Exception as e:
-            print(f"   Direct search error: {e}")
+            print(f"   Direct fetch error: {e}")
         
     except Exception as e:
         print(f"❌ Error counting documents: {e}")
 
 
-def search_documents(query: str = "employee", k: int = 5):
-    """Search for documents and display results."""
+def search_documents(query: str = "employee", k: int = 5, results_cache: dict = None):
+    """
+    Search for documents and display results.
+    
+    If results_cache is given, results are reused for a query already
+    searched with the same k.
+    """
     print("\n" + "=" * 70)
     print(f"Search Results for: '{query}'")
     print("=" * 70)
     print()
     
     try:
-        rag_engine = get_rag_engine()
-        docs = rag_engine.retrieve_context(query, k=k)
+        cache_key = (query, k)
+        if results_cache is not None and cache_key in results_cache:
+            docs = results_cache[cache_key]
+        else:
+            rag_engine = get_rag_engine()
+            docs = rag_engine.retrieve_context(query, k=k)
+            if results_cache is not None:
+                results_cache[cache_key] = docs
         
         if not docs:
             print("⚠️  No documents found")
@@ -144,36 +139,23 @@ def list_document_types():
     print()
     
     try:
-        rag_engine = get_rag_engine()
-        
-        # Search with broad queries to get all types
-        all_docs = []
-        queries = ["employee", "financial", "advance", "domain", "knowledge"]
+        vector_store = get_vector_store()
         
-        seen = set()
-        for query in queries:
-            docs = rag_engine.retrieve_context(query, k=20)
-            for doc in docs:
-                doc_id = hash(doc.page_content)
-                if doc_id not in seen:
-                    seen.add(doc_id)
-                    all_docs.append(doc)
+        # Exact breakdown from the stored metadata, read in pages, with no
+        # embeddings or similarity search
+        type_counts = Counter(
+            metadata.get("type", "unknown") for metadata in vector_store.iter_metadatas()
+        )
         
-        if not all_docs:
+        if not type_counts:
             print("⚠️  No documents found")
             return
         
-        # Count by type
-        type_counts = {}
-        for doc in all_docs:
-            doc_type = doc.metadata.get("type", "unknown")
-            type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-        
         print("Document types found:")
         for doc_type, count in sorted(type_counts.items()):
             print(f"  - {doc_type}: {count}")
         
-        print(f"\nTotal unique documents: {len(all_docs)}")
+        print(f"\nTotal documents: {sum(type_counts.values())}")
         
     except Exception as e:
         print(f"❌ Error listing document types: {e}")
@@ -188,6 +170,9 @@ def interactive_search():
     print("Enter search queries (type 'exit' to quit, 'list' to see types)")
     print()
     
+    # Results of queries already entered in this session
+    results_cache = {}
+    
     while True:
         try:
             query = input("Search query: ").strip()
@@ -200,7 +185,7 @@ def interactive_search():
             elif not query:
                 continue
             
-            search_documents(query, k=3)
+            search_documents(query, k=3, results_cache=results_cache)
             print()
             
         except KeyboardInterrupt:
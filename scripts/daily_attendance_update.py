@@ -11,6 +11,7 @@ Can be scheduled via:
     - Linux/Unix cron job
     - Cloud scheduler (e.g., AWS EventBridge, Google Cloud Scheduler)
 """
+import logging
 import sys
 import os
 from datetime import date
@@ -28,10 +29,12 @@ from app.services.salary_service import (
     reset_monthly_salary_for_new_month
 )
 
+logger = logging.getLogger(__name__)
+
 
 def main():
     """Main function to update daily attendance for all employees"""
-    print(f"Starting daily attendance update for {date.today()}...")
+    logger.info("Starting daily attendance update for %s...", date.today())
     
     # Initialize database connection
     engine = get_engine(DATABASE_URL)
@@ -42,40 +45,70 @@ def main():
         
         # First, check if we need to reset monthly data (if it's the 1st of the month)
         if today.day == 1:
-            print("First day of month detected - resetting monthly data...")
+            logger.info("First day of month detected - resetting monthly data...")
             
             # Reset monthly attendance
-            attendance_reset_count = reset_monthly_attendance_for_new_month(session)
+            attendance_reset_count = reset_monthly_attendance_for_new_month(session, commit=False)
             if attendance_reset_count > 0:
-                print(f"✓ Reset monthly attendance for {attendance_reset_count} employees")
+                logger.info("✓ Reset monthly attendance for %d employees", attendance_reset_count)
             
             # Reset monthly salary (carries forward negative balances)
-            salary_stats = reset_monthly_salary_for_new_month(session)
+            salary_stats = reset_monthly_salary_for_new_month(session, commit=False)
             if salary_stats['reset_count'] > 0:
-                print(f"✓ Reset monthly salary:")
-                print(f"  - Carried forward debts: {salary_stats['carried_forward']}")
-                print(f"  - Reset to zero: {salary_stats['reset_to_zero']}")
+                logger.info(
+                    "✓ Reset monthly salary:\n"
+                    "  - Carried forward debts: %d\n"
+                    "  - Reset to zero: %d",
+                    salary_stats['carried_forward'],
+                    salary_stats['reset_to_zero'],
+                )
         
         # Update attendance for all employees
-        stats = update_all_employees_attendance(session)
+        stats = update_all_employees_attendance(session, commit=False)
+        
+        # Month-start resets and the daily update are applied together, so a
+        # failure part-way leaves the database untouched
+        session.commit()
         
-        print(f"\n=== Attendance Update Summary ===")
-        print(f"Total employees processed: {stats['total_employees']}")
-        print(f"✓ Updated (worked today): {stats['updated']}")
-        print(f"- Off days: {stats['off_days']}")
-        print(f"- Already counted today: {stats['already_counted']}")
-        print(f"- Not started employment: {stats['not_started']}")
-        print(f"\nDaily update completed successfully!")
+        logger.info(
+            "\n=== Attendance Update Summary ===\n"
+            "Total employees processed: %d\n"
+            "✓ Updated (worked today): %d\n"
+            "- Off days: %d\n"
+            "- Already counted today: %d\n"
+            "- Not started employment: %d",
+            stats['total_employees'],
+            stats['updated'],
+            stats['off_days'],
+            stats['already_counted'],
+            stats['not_started'],
+        )
+        logger.info("Daily update completed successfully!")
         
     except Exception as e:
-        print(f"ERROR: Failed to update: {str(e)}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        logger.exception("ERROR: Failed to update: %s", e)
         session.rollback()
         sys.exit(1)
     finally:
         session.close()
 
 
+def _configure_logging():
+    """Send progress (INFO) to stdout and warnings/errors to stderr."""
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setLevel(logging.INFO)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    stdout_handler.setFormatter(formatter)
+    
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setLevel(logging.WARNING)
+    stderr_handler.setFormatter(formatter)
+    
+    logging.basicConfig(level=logging.INFO, handlers=[stdout_handler, stderr_handler])
+
+
 if __name__ == "__main__":
+    _configure_logging()
     main()
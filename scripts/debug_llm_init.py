@@ -1,5 +1,6 @@
 """Debug LLM initialization to see which method is being used."""
 
+import importlib.util
 import sys
 import warnings
 from pathlib import Path
@@ -16,21 +17,19 @@ print("=" * 70)
 print()
 
 try:
-    # Check imports
+    # Check imports (find_spec only locates the packages, without importing them)
     print("1. Checking imports...")
-    try:
-        from huggingface_hub import InferenceClient
+    if importlib.util.find_spec("huggingface_hub") is not None:
         print("   ✅ InferenceClient available")
         INFERENCE_CLIENT_AVAILABLE = True
-    except ImportError as e:
-        print(f"   ❌ InferenceClient not available: {e}")
+    else:
+        print("   ❌ InferenceClient not available: huggingface_hub is not installed")
         INFERENCE_CLIENT_AVAILABLE = False
     
-    try:
-        from openai import OpenAI
+    if importlib.util.find_spec("openai") is not None:
         print("   ✅ OpenAI client available")
         OPENAI_CLIENT_AVAILABLE = True
-    except ImportError:
+    else:
         print("   ❌ OpenAI client not available")
         OPENAI_CLIENT_AVAILABLE = False
     
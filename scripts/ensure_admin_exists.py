@@ -12,6 +12,7 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from sqlalchemy.exc import IntegrityError
 from app.models.schema import get_engine, get_session, Employee, Role, UserAuth
 from app.config.config import DATABASE_URL
 
@@ -42,7 +43,9 @@ def ensure_admin_exists(
         employment_start_date = date.today()
     
     engine = get_engine(DATABASE_URL)
-    session = get_session(engine)
+    # Keep loaded attributes after commit, so reporting the new rows needs
+    # no refresh SELECTs
+    session = get_session(engine, expire_on_commit=False)
     
     try:
         # Check if any admin employee already exists
@@ -79,15 +82,6 @@ def ensure_admin_exists(
         print(f"  Salary: {salary}")
         print(f"  PIN: {pin}")
         
-        # Check if phone number already exists
-        existing_phone = session.query(Employee).filter(Employee.phone_no == phone_no).first()
-        if existing_phone:
-            raise ValueError(
-                f"Phone number {phone_no} already exists for employee "
-                f"'{existing_phone.first_name} {existing_phone.last_name}'. "
-                f"Please use a different phone number."
-            )
-        
         # Create admin employee
         admin_employee = Employee(
             first_name=first_name,
@@ -101,19 +95,32 @@ def ensure_admin_exists(
             used_salary=0.0
         )
         
-        session.add(admin_employee)
-        session.flush()  # Flush to get the ID
-        
-        # Create UserAuth entry for login
+        # Create UserAuth entry for login (no FK to employee, so both rows
+        # can be inserted in the same flush)
         user_auth = UserAuth(
             first_name=first_name,
             pin=pin
         )
         
-        session.add(user_auth)
-        session.commit()
-        session.refresh(admin_employee)
-        session.refresh(user_auth)
+        session.add_all([admin_employee, user_auth])
+        try:
+            session.commit()
+        except IntegrityError as e:
+            # phone_no is UNIQUE, so the database rejects a duplicate atomically
+            if 'phone_no' in str(e.orig):
+                session.rollback()
+                existing_phone = session.query(Employee).filter(
+                    Employee.phone_no == phone_no
+                ).first()
+                owner = (
+                    f" for employee '{existing_phone.first_name} {existing_phone.last_name}'"
+                    if existing_phone else ""
+                )
+                raise ValueError(
+                    f"Phone number {phone_no} already exists{owner}. "
+                    f"Please use a different phone number."
+                ) from e
+            raise
         
         print(f"\n✓ Admin employee created successfully!")
         print(f"  Employee ID: {admin_employee.id}")
@@ -11,32 +11,29 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from sqlalchemy import text, inspect
-from app.models.schema import get_engine, Base, SalaryPayment
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.models.schema import get_engine, SalaryPayment
 from app.config.config import DATABASE_URL
 
 def ensure_table():
     """Ensure salary_payment table exists"""
-    print("Checking if salary_payment table exists...")
+    print("Ensuring salary_payment table exists...")
     
     engine = get_engine(DATABASE_URL)
-    inspector = inspect(engine)
     
-    # Check if table exists
-    tables = inspector.get_table_names()
-    if 'salary_payment' in tables:
-        print("✓ salary_payment table already exists")
-        return True
-    
-    print("Table not found. Creating salary_payment table...")
-    
-    # Create the table using SQLAlchemy
-    Base.metadata.create_all(bind=engine, tables=[SalaryPayment.__table__])
+    with engine.begin() as conn:
+        # Idempotent create from the model: no existence pre-check needed
+        conn.execute(CreateTable(SalaryPayment.__table__, if_not_exists=True))
+        for index in SalaryPayment.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        
+        table_exists = conn.execute(
+            text("SELECT to_regclass('public.salary_payment')")
+        ).scalar() is not None
     
-    # Verify it was created
-    tables = inspector.get_table_names()
-    if 'salary_payment' in tables:
-        print("✓ salary_payment table created successfully!")
+    if table_exists:
+        print("✓ salary_payment table is ready")
         return True
     else:
         print("✗ Failed to create table")
@@ -11,9 +11,18 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from sqlalchemy import inspect, text
-from app.models.schema import get_engine, Base, SalaryPayment
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.models.schema import get_engine, SalaryPayment
 from app.config.config import DATABASE_URL
 
+
+def _table_exists(conn, name):
+    """Check for a table in the public schema with a single catalog lookup."""
+    return conn.execute(
+        text("SELECT to_regclass(:name)"), {"name": f"public.{name}"}
+    ).scalar() is not None
+
+
 print("=" * 60)
 print("Salary Payment Table Fix")
 print("=" * 60)
@@ -21,65 +30,28 @@ print()
 
 try:
     engine = get_engine(DATABASE_URL)
-    inspector = inspect(engine)
     
-    # Check if table exists
-    tables = inspector.get_table_names()
-    print(f"Found {len(tables)} tables in database")
-    
-    if 'salary_payment' in tables:
-        print("✓ salary_payment table already exists")
+    with engine.connect() as conn:
+        # Idempotent create from the model: no existence pre-check needed,
+        # the statements either succeed or raise
+        conn.execute(CreateTable(SalaryPayment.__table__, if_not_exists=True))
+        for index in SalaryPayment.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        conn.commit()
         
-        # Check if it has data
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT COUNT(*) FROM salary_payment"))
-            count = result.scalar()
-            print(f"  - Records in table: {count}")
-    else:
-        print("✗ salary_payment table does NOT exist")
-        print("\nCreating table...")
+        if not _table_exists(conn, 'salary_payment'):
+            print("✗ salary_payment table does NOT exist. Check database connection.")
+            sys.exit(1)
+        print("✓ salary_payment table exists")
         
-        # Create the table
-        Base.metadata.create_all(bind=engine, tables=[SalaryPayment.__table__])
+        # Check if it has data
+        result = conn.execute(text("SELECT COUNT(*) FROM salary_payment"))
+        count = result.scalar()
+        print(f"  - Records in table: {count}")
         
-        # Verify creation
-        inspector = inspect(engine)
-        tables = inspector.get_table_names()
-        if 'salary_payment' in tables:
-            print("✓ Table created successfully!")
-        else:
-            print("✗ Failed to create table")
-            print("\nTrying alternative method...")
-            
-            # Try direct SQL creation
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS salary_payment (
-                        id SERIAL PRIMARY KEY,
-                        employee_id INTEGER NOT NULL REFERENCES employee(id),
-                        amount_paid FLOAT NOT NULL,
-                        payment_date DATE NOT NULL DEFAULT CURRENT_DATE,
-                        notes TEXT,
-                        paid_by_id INTEGER NOT NULL REFERENCES employee(id),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """))
-                conn.commit()
-            
-            # Verify again
-            inspector = inspect(engine)
-            tables = inspector.get_table_names()
-            if 'salary_payment' in tables:
-                print("✓ Table created using direct SQL!")
-            else:
-                print("✗ Still failed. Check database connection.")
-                sys.exit(1)
-    
-    # Check foreign keys
-    print("\nVerifying table structure...")
-    with engine.connect() as conn:
-        columns = inspector.get_columns('salary_payment')
+        # Check foreign keys
+        print("\nVerifying table structure...")
+        columns = inspect(conn).get_columns('salary_payment')
         print(f"  - Columns: {len(columns)}")
         for col in columns:
             print(f"    • {col['name']}")
@@ -90,8 +62,8 @@ try:
     print("\nYou can now use the salary payment feature in the admin dashboard.")
     
 except Exception as e:
-    print(f"\n✗ Error: {str(e)}")
+    print(f"\n✗ Error: {str(e)}", file=sys.stderr)
     import traceback
-    print("\nTraceback:")
-    print(traceback.format_exc())
+    print("\nTraceback:", file=sys.stderr)
+    traceback.print_exc()
     sys.exit(1)
@@ -0,0 +1,46 @@
+"""
+Migration script to add indexes used by salary sums and report listings.
+Run this script to add the indexes to an existing database.
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import MetaData
+from sqlalchemy.schema import CreateIndex
+from app.models.schema import get_engine, Bill, Advance, OffDay, SalaryPayment
+from app.config.config import DATABASE_URL
+
+
+REPORT_TABLES = [Bill, Advance, OffDay, SalaryPayment]
+
+
+def migrate():
+    """Create report indexes if they don't exist."""
+    print("Connecting to database...")
+    engine = get_engine(DATABASE_URL)
+    
+    # Copy the tables into a separate MetaData so the CONCURRENTLY option is
+    # set on copies of the indexes, not on the models' shared Index objects
+    metadata = MetaData()
+    tables = [model.__table__.to_metadata(metadata) for model in REPORT_TABLES]
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in tables:
+            for index in table.indexes:
+                print(f"Creating index {index.name}...")
+                index.dialect_options["postgresql"]["concurrently"] = True
+                conn.execute(CreateIndex(index, if_not_exists=True))
+                print(f"✓ {index.name}")
+    
+    print("\nMigration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
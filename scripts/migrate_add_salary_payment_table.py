@@ -23,44 +23,39 @@ def migrate():
     engine = get_engine(DATABASE_URL)
     
     with engine.connect() as conn:
-        # Check if table already exists
-        result = conn.execute(text("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name = 'salary_payment'
+        # IF NOT EXISTS makes each statement idempotent, so there is no
+        # separate existence check (and no race between check and create)
+        print("Creating salary_payment table if needed...")
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS salary_payment (
+                id SERIAL PRIMARY KEY,
+                employee_id INTEGER NOT NULL REFERENCES employee(id),
+                amount_paid FLOAT NOT NULL,
+                payment_date DATE NOT NULL DEFAULT CURRENT_DATE,
+                notes TEXT,
+                paid_by_id INTEGER NOT NULL REFERENCES employee(id),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
         """))
-        table_exists = result.fetchone() is not None
         
+        # Create index on employee_id for faster queries
+        print("Creating indexes if needed...")
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_salary_payment_employee_id ON salary_payment(employee_id)
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_salary_payment_payment_date ON salary_payment(payment_date)
+        """))
+        conn.commit()
+        
+        table_exists = conn.execute(
+            text("SELECT to_regclass('public.salary_payment')")
+        ).scalar() is not None
         if table_exists:
-            print("✓ salary_payment table already exists")
+            print("✓ salary_payment table and indexes are in place")
         else:
-            print("Creating salary_payment table...")
-            conn.execute(text("""
-                CREATE TABLE salary_payment (
-                    id SERIAL PRIMARY KEY,
-                    employee_id INTEGER NOT NULL REFERENCES employee(id),
-                    amount_paid FLOAT NOT NULL,
-                    payment_date DATE NOT NULL DEFAULT CURRENT_DATE,
-                    notes TEXT,
-                    paid_by_id INTEGER NOT NULL REFERENCES employee(id),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            conn.commit()
-            print("✓ Created salary_payment table")
-            
-            # Create index on employee_id for faster queries
-            print("Creating indexes...")
-            conn.execute(text("""
-                CREATE INDEX idx_salary_payment_employee_id ON salary_payment(employee_id)
-            """))
-            conn.execute(text("""
-                CREATE INDEX idx_salary_payment_payment_date ON salary_payment(payment_date)
-            """))
-            conn.commit()
-            print("✓ Created indexes")
+            print("✗ salary_payment table was not created")
     
     print("\nMigration complete!")
 
@@ -12,26 +12,27 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from sqlalchemy import text, func
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import inspect, text, func, select, update
+from sqlalchemy.schema import CreateIndex
 from app.models.schema import get_engine, Employee, Bill, Advance, AdvanceStatus
 from app.config.config import DATABASE_URL
 
 
-def migrate():
-    """Add used_salary column and populate it with calculated values from bills and advances."""
+def migrate(verbose: bool = False):
+    """
+    Add used_salary column and populate it with calculated values from bills and advances.
+    
+    Args:
+        verbose: Print each employee's resulting used_salary
+    """
     print("Connecting to database...")
     engine = get_engine(DATABASE_URL)
     
-    with engine.connect() as conn:
-        # Check if column already exists
-        result = conn.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'employee' 
-            AND column_name = 'used_salary'
-        """))
-        existing_columns = [row[0] for row in result]
+    # Schema change and backfill run on one connection in one transaction:
+    # if the backfill fails, the ALTER is rolled back with it
+    with engine.begin() as conn:
+        # Check if column already exists (dialect's catalog query via the inspector)
+        existing_columns = {column["name"] for column in inspect(conn).get_columns("employee")}
         
         # Add used_salary if it doesn't exist
         if 'used_salary' not in existing_columns:
@@ -40,49 +41,83 @@ def migrate():
                 ALTER TABLE employee 
                 ADD COLUMN used_salary FLOAT DEFAULT 0.0
             """))
-            conn.commit()
             print("✓ Added used_salary column")
         else:
             print("✓ used_salary column already exists")
-    
-    # Now populate the column with calculated values from bills and approved advances
-    print("\nCalculating and updating used_salary for all employees...")
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
-    try:
-        employees = db.query(Employee).all()
-        for employee in employees:
-            # Calculate current used salary from bills and approved advances
-            bills_sum = (
-                db.query(func.coalesce(func.sum(Bill.amount_billed), 0.0))
-                .filter(Bill.billed_employee_id == employee.id)
-                .scalar()
+        
+        # Index the per-employee lookups the backfill sums over, so each
+        # subquery is an index scan instead of a scan of the whole table
+        print("\nEnsuring backfill indexes exist...")
+        for index in (*Bill.__table__.indexes, *Advance.__table__.indexes):
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        print("✓ Backfill indexes ready")
+        
+        # Now populate the column with calculated values from bills and approved advances
+        print("\nCalculating and updating used_salary for all employees...")
+        
+        # Compute used_salary for every employee on the server: bills plus
+        # approved advances
+        bills_sum = (
+            select(func.coalesce(func.sum(Bill.amount_billed), 0.0))
+            .where(Bill.billed_employee_id == Employee.id)
+            .scalar_subquery()
+        )
+        advances_sum = (
+            select(func.coalesce(func.sum(Advance.amount_for_advance), 0.0))
+            .where(
+                Advance.employee_id == Employee.id,
+                Advance.status == AdvanceStatus.APPROVED
             )
-            
-            advances_sum = (
-                db.query(func.coalesce(func.sum(Advance.amount_for_advance), 0.0))
-                .filter(
-                    Advance.employee_id == employee.id,
-                    Advance.status == AdvanceStatus.APPROVED
-                )
-                .scalar()
+            .scalar_subquery()
+        )
+        totals = (
+            select(
+                Employee.id.label("employee_id"),
+                (bills_sum + advances_sum).label("used_salary"),
             )
-            
-            used_salary = float(bills_sum or 0) + float(advances_sum or 0)
-            employee.used_salary = used_salary
-            print(f"  {employee.first_name} {employee.last_name}: KSH {used_salary:,.2f}")
+            .subquery()
+        )
         
-        db.commit()
-        print(f"\n✓ Updated used_salary for {len(employees)} employees")
-    except Exception as e:
-        print(f"Error updating used_salary: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+        # ...and store it in one UPDATE that only writes rows whose value
+        # actually changes (e.g. employees with no activity already at 0.0)
+        result = conn.execute(
+            update(Employee.__table__)
+            .where(
+                Employee.id == totals.c.employee_id,
+                Employee.used_salary.is_distinct_from(totals.c.used_salary),
+            )
+            # Keep updated_at as is: the daily attendance job reads it as the
+            # last day counted, and a backfill must not look like one
+            .values(used_salary=totals.c.used_salary, updated_at=Employee.updated_at)
+        )
+        
+        if verbose:
+            # Stream the rows in chunks instead of buffering the whole table
+            employees = conn.execution_options(stream_results=True, yield_per=1000).execute(
+                select(Employee.first_name, Employee.last_name, Employee.used_salary)
+                .order_by(Employee.id)
+            )
+            # One write per fetched chunk instead of a print per employee
+            for partition in employees.partitions():
+                sys.stdout.write("".join(
+                    f"  {first_name} {last_name}: KSH {used_salary:,.2f}\n"
+                    for first_name, last_name, used_salary in partition
+                ))
+        
+        print(f"\n✓ Updated used_salary for {result.rowcount} employees (all others were already correct)")
     
     print("\nMigration complete!")
 
 
 if __name__ == "__main__":
-    migrate()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Add and backfill the employee.used_salary column")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print each employee's used_salary after the backfill"
+    )
+    args = parser.parse_args()
+    
+    migrate(verbose=args.verbose)
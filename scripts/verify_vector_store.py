@@ -1,6 +1,8 @@
 """Simple script to verify vector store contents."""
 
 import sys
+import traceback
+from collections import Counter
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
@@ -32,30 +34,37 @@ try:
     
     # Try multiple queries to find documents
     queries = ["employee", "financial", "advance", "summary"]
-    all_docs = []
+    # Tally types as documents arrive and keep only the few shown as samples
+    type_counts = Counter()
+    sample_docs = []
     seen = set()
     
-    for query in queries:
-        try:
-            docs = rag.retrieve_context(query, k=10)
-            for doc in docs:
-                doc_id = hash(doc.page_content)
-                if doc_id not in seen:
-                    seen.add(doc_id)
-                    all_docs.append(doc)
-        except Exception as e:
-            print(f"   Query '{query}' error: {e}")
+    # All probe queries are searched in one vector store call; if that fails,
+    # retry them one at a time so each failing query is reported on its own
+    try:
+        results = rag.retrieve_context_batch(queries, k=10)
+    except Exception:
+        results = []
+        for query in queries:
+            try:
+                results.append(rag.retrieve_context(query, k=10))
+            except Exception as e:
+                print(f"   Query '{query}' error: {e}")
     
-    print(f"✅ Found {len(all_docs)} unique documents")
+    for docs in results:
+        for doc in docs:
+            # Chroma ID when available, so page contents aren't hashed per query
+            doc_id = doc.metadata.get("chroma_id", doc.page_content)
+            if doc_id not in seen:
+                seen.add(doc_id)
+                type_counts[doc.metadata.get("type", "unknown")] += 1
+                if len(sample_docs) < 3:
+                    sample_docs.append(doc)
+    
+    print(f"✅ Found {len(seen)} unique documents")
     print()
     
-    if all_docs:
-        # Count by type
-        type_counts = {}
-        for doc in all_docs:
-            doc_type = doc.metadata.get("type", "unknown")
-            type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-        
+    if seen:
         print("Document Breakdown:")
         for doc_type, count in sorted(type_counts.items()):
             print(f"  - {doc_type}: {count}")
@@ -63,7 +72,7 @@ try:
         
         # Show sample documents
         print("Sample Documents:")
-        for i, doc in enumerate(all_docs[:3], 1):
+        for i, doc in enumerate(sample_docs, 1):
             print(f"\n  Document {i}:")
             print(f"    Type: {doc.metadata.get('type', 'unknown')}")
             if 'employee_name' in doc.metadata:
@@ -80,6 +89,5 @@ try:
     
 except Exception as e:
     print(f"❌ Error: {e}")
-    import traceback
     traceback.print_exc()
     sys.exit(1)